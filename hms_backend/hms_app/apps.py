@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class HmsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hms_app'
+
+    def ready(self):
+        from . import serializers_fastfields, signals  # noqa: F401 (signals registers receivers)
+        serializers_fastfields.install()
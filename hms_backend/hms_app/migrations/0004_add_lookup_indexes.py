@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-15 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hms_app', '0003_medicalreport_file_alter_userprofile_role_nurse_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['doctor', 'appointment_date', 'status'], name='hms_app_app_doctor__1625ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['patient', 'appointment_date'], name='hms_app_app_patient_800794_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['doctor', 'patient'], name='hms_app_app_doctor__a5f1de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doctoravailability',
+            index=models.Index(fields=['doctor', 'is_active'], name='hms_app_doc_doctor__33d638_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['user', 'role'], name='hms_app_use_user_id_ba5d7d_idx'),
+        ),
+    ]
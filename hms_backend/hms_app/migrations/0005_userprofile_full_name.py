@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-15 18:16
+
+from django.db import migrations, models
+
+
+def backfill_full_name(apps, schema_editor):
+    UserProfile = apps.get_model('hms_app', 'UserProfile')
+    profiles = list(UserProfile.objects.select_related('user'))
+    for profile in profiles:
+        profile.full_name = f"{profile.user.first_name} {profile.user.last_name}".strip()
+    UserProfile.objects.bulk_update(profiles, ['full_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hms_app', '0004_add_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='full_name',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=301),
+        ),
+        migrations.RunPython(backfill_full_name, migrations.RunPython.noop),
+    ]
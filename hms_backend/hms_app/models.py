@@ -1,8 +1,15 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Concat, Trim
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+def _role(user):
+    profile = getattr(user, 'profile', None)
+    return profile.role if profile is not None else None
+
+
 class UserProfile(models.Model):
     """Extended user profile for role-based access"""
     ROLE_CHOICES = [
@@ -14,6 +21,8 @@ class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
+    # Copy of user.get_full_name(), kept in sync by the signals in signals.py
+    full_name = models.CharField(max_length=301, blank=True, default='', db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -22,6 +31,20 @@ class UserProfile(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'role']),
+        ]
+
+
+class DoctorQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Doctors see only their own profile, everyone else sees the available doctors"""
+        role = _role(user)
+        if role is None:
+            return self.none()
+        if role == 'doctor':
+            return self.filter(user=user).select_related('user')
+        return self.filter(is_available=True).select_related('user')
 
 
 class Doctor(models.Model):
@@ -35,6 +58,8 @@ class Doctor(models.Model):
     is_available = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DoctorQuerySet.as_manager()
     
     def __str__(self):
         return f"Dr. {self.user.get_full_name()}"
@@ -69,6 +94,32 @@ class DoctorAvailability(models.Model):
     class Meta:
         ordering = ['day_of_week', 'start_time']
         unique_together = ['doctor', 'day_of_week', 'start_time', 'end_time']
+        indexes = [
+            models.Index(fields=['doctor', 'is_active']),
+        ]
+
+
+class AppointmentQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Appointments the user may see (doctor: their own, nurse: all, patient: booked by them)"""
+        role = _role(user)
+        if role is None:
+            return self.none()
+        if role == 'doctor':
+            doctor = getattr(user, 'doctor_profile', None)
+            if doctor is None:
+                return self.none()
+            return self.filter(doctor=doctor)
+        if role == 'nurse':
+            return self.all()
+        return self.filter(patient=user)
+
+    def with_participant_names(self):
+        """Annotate doctor_full_name/patient_full_name, built by the database like get_full_name()"""
+        return self.annotate(
+            doctor_full_name=Trim(Concat('doctor__user__first_name', Value(' '), 'doctor__user__last_name')),
+            patient_full_name=Trim(Concat('patient__first_name', Value(' '), 'patient__last_name')),
+        )
 
 
 class Appointment(models.Model):
@@ -90,6 +141,8 @@ class Appointment(models.Model):
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AppointmentQuerySet.as_manager()
     
     def __str__(self):
         patient_name = self.patient.get_full_name() or self.patient.username
@@ -98,6 +151,11 @@ class Appointment(models.Model):
     class Meta:
         ordering = ['-appointment_date', '-start_time']
         unique_together = ['doctor', 'appointment_date', 'start_time']
+        indexes = [
+            models.Index(fields=['doctor', 'appointment_date', 'status']),
+            models.Index(fields=['patient', 'appointment_date']),
+            models.Index(fields=['doctor', 'patient']),
+        ]
 
 
 class Nurse(models.Model):
@@ -116,6 +174,25 @@ class Nurse(models.Model):
         ordering = ['user__first_name', 'user__last_name']
 
 
+class MedicalReportQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Reports the user may see (doctor: patients they have appointments with, nurse: all, patient: own)"""
+        role = _role(user)
+        if role is None:
+            return self.none()
+        reports = self.select_related('patient__profile', 'doctor__user__profile', 'nurse__user')
+        if role == 'doctor':
+            doctor = getattr(user, 'doctor_profile', None)
+            if doctor is None:
+                return self.none()
+            # Checked in the same statement through a correlated EXISTS
+            seen_by_doctor = Appointment.objects.filter(doctor=doctor, patient=OuterRef('patient'))
+            return reports.filter(Exists(seen_by_doctor))
+        if role == 'nurse':
+            return reports
+        return reports.filter(patient=user)
+
+
 class MedicalReport(models.Model):
     """Medical reports / history entries for a patient"""
     patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='medical_reports')
@@ -128,6 +205,8 @@ class MedicalReport(models.Model):
     file = models.FileField(upload_to='medical_reports/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = MedicalReportQuerySet.as_manager()
+
     def __str__(self):
         return f"Report for {self.patient.username} on {self.report_date}"
 
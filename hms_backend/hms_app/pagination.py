@@ -0,0 +1,8 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """Page-number pagination for the doctor, appointment and medical report lists"""
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
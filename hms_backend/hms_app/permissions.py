@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from .models import UserProfile, Doctor
+from .utils import get_role
 
 
 class IsDoctorOrReadOnly(permissions.BasePermission):
@@ -9,11 +9,7 @@ class IsDoctorOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            return profile.role == 'doctor'
-        except UserProfile.DoesNotExist:
-            return False
+        return get_role(request) == 'doctor'
 
 
 class IsPatientOrReadOnly(permissions.BasePermission):
@@ -23,11 +19,7 @@ class IsPatientOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            return profile.role == 'patient'
-        except UserProfile.DoesNotExist:
-            return False
+        return get_role(request) == 'patient'
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -56,17 +48,14 @@ class IsReportAuthorOrNurseOrReadOnly(permissions.BasePermission):
             pass
 
         # Determine role
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
-            return False
+        role = get_role(request)
 
         # Nurses can edit
-        if profile.role == 'nurse':
+        if role == 'nurse':
             return True
 
         # Doctors can edit only reports they authored
-        if profile.role == 'doctor':
+        if role == 'doctor':
             try:
                 return obj.doctor is not None and obj.doctor.user == request.user
             except Exception:
@@ -1,9 +1,20 @@
+import functools
+import operator
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
 from .models import UserProfile, Doctor, DoctorAvailability, Appointment
 from .models import MedicalReport, Nurse
 
 
+def _full_name(user):
+    """Read the user's denormalized full name from their profile, if they have one."""
+    profile = getattr(user, 'profile', None)
+    return profile.full_name if profile is not None else user.get_full_name()
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -37,18 +48,90 @@ class DoctorSerializer(serializers.ModelSerializer):
                   'bio', 'consultation_fee', 'is_available', 'availability_slots']
 
 
+def _is_concrete_field(model, name):
+    try:
+        return model._meta.get_field(name).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+def _row_renderer(serializer):
+    """Compile a flat, read-only ModelSerializer into a plain instance -> dict function.
+
+    The keys, sources and value formatting all come from the serializer's own
+    fields, so the rendered rows keep the serializer's shape without going
+    through DRF's per-field machinery for every row. Only fields backed by a
+    single concrete model field are supported (nested serializers included):
+    method fields, ``source='*'``, dotted, reverse and callable sources are rejected.
+    """
+    model = serializer.Meta.model
+    columns = []
+    for name, field in serializer.fields.items():
+        attrs = field.source_attrs
+        assert len(attrs) == 1 and _is_concrete_field(model, attrs[0]), (
+            f'{serializer.__class__.__name__}.{name} is not a plain model field and cannot be row-rendered'
+        )
+        getter = operator.attrgetter(attrs[0])
+        if isinstance(field, serializers.BaseSerializer):
+            render = _row_renderer(field)
+        else:
+            render = field.to_representation
+        columns.append((name, getter, render))
+
+    def render_row(instance):
+        row = {}
+        for name, getter, render in columns:
+            value = getter(instance)
+            row[name] = None if value is None else render(value)
+        return row
+    return render_row
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_row_renderer(serializer_class):
+    return _row_renderer(serializer_class())
+
+
+class RowRenderedListSerializer(serializers.ListSerializer):
+    """Read-only list serializer that renders each row with its child's compiled _row_renderer"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        render_row = _compiled_row_renderer(type(self.child))
+        return [render_row(item) for item in iterable]
+
+
+class DoctorListSerializer(serializers.ModelSerializer):
+    """Lightweight doctor representation for list views (no bio or nested slots)"""
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Doctor
+        fields = ['id', 'user', 'specialization', 'experience_years', 'consultation_fee', 'is_available']
+        list_serializer_class = RowRenderedListSerializer
+
+
 class AppointmentSerializer(serializers.ModelSerializer):
-    doctor_name = serializers.CharField(source='doctor.user.get_full_name', read_only=True)
-    patient_name = serializers.CharField(source='patient.get_full_name', read_only=True)
+    doctor_name = serializers.SerializerMethodField(read_only=True)
+    patient_name = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = Appointment
         fields = ['id', 'doctor', 'doctor_name', 'patient', 'patient_name', 
                   'appointment_date', 'start_time', 'end_time', 'reason', 'status', 'notes']
 
+    def get_doctor_name(self, obj):
+        """Use the name annotated by the viewset queryset, falling back for unannotated instances."""
+        name = getattr(obj, 'doctor_full_name', None)
+        return name if name is not None else obj.doctor.user.get_full_name()
+
+    def get_patient_name(self, obj):
+        name = getattr(obj, 'patient_full_name', None)
+        return name if name is not None else obj.patient.get_full_name()
+
 
 class MedicalReportSerializer(serializers.ModelSerializer):
-    patient_name = serializers.CharField(source='patient.get_full_name', read_only=True)
+    patient_name = serializers.SerializerMethodField(read_only=True)
     doctor_name = serializers.SerializerMethodField(read_only=True)
     doctor_user = serializers.IntegerField(source='doctor.user.id', read_only=True, allow_null=True)
     nurse_user = serializers.IntegerField(source='nurse.user.id', read_only=True, allow_null=True)
@@ -58,10 +141,13 @@ class MedicalReportSerializer(serializers.ModelSerializer):
         model = MedicalReport
         fields = ['id', 'patient', 'patient_name', 'doctor', 'doctor_user', 'doctor_name', 'nurse_user', 'report_date', 'summary', 'details', 'file_url', 'file', 'created_at']
 
+    def get_patient_name(self, obj):
+        return _full_name(obj.patient)
+
     def get_doctor_name(self, obj):
         """Return doctor full name or 'Staff' if no doctor is set."""
         if obj.doctor and obj.doctor.user:
-            return obj.doctor.user.get_full_name() or obj.doctor.user.username
+            return _full_name(obj.doctor.user) or obj.doctor.user.username
         return 'Staff'
 
 
@@ -84,6 +170,7 @@ class SignUpSerializer(serializers.Serializer):
             raise serializers.ValidationError("Email already exists")
         return value
     
+    @transaction.atomic
     def create(self, validated_data):
         user = User.objects.create_user(
             username=validated_data['username'],
@@ -107,6 +194,7 @@ class DoctorSignUpSerializer(SignUpSerializer):
     license_number = serializers.CharField(max_length=50)
     experience_years = serializers.IntegerField(min_value=0)
     
+    @transaction.atomic
     def create(self, validated_data):
         user = super().create(validated_data)
         
@@ -124,6 +212,7 @@ class NurseSignUpSerializer(SignUpSerializer):
     employee_id = serializers.CharField(max_length=50)
     department = serializers.CharField(max_length=100, required=False)
     
+    @transaction.atomic
     def create(self, validated_data):
         # Update role to nurse before parent create
         validated_data['role'] = 'nurse'
@@ -0,0 +1,36 @@
+"""
+Memoize ModelSerializer field construction per serializer class.
+
+ModelSerializer.get_fields() rebuilds every field from the model's Meta on
+each instantiation, and DRF deep-copies the declared fields along the way.
+The result only depends on the serializer class, so build it once and hand
+each instance its own copies.
+"""
+import copy
+
+from rest_framework import serializers
+
+_fields_cache = {}
+_original_get_fields = serializers.ModelSerializer.get_fields
+
+
+def _copy_field(field):
+    # Nested serializers and container fields (ManyRelatedField.child_relation,
+    # ListField/DictField.child) hold child fields bound to their parent; a
+    # shallow copy would share those children with the cached prototype and
+    # lose the instance's context, so they still get a full copy.
+    if (isinstance(field, serializers.BaseSerializer)
+            or hasattr(field, 'child_relation') or hasattr(field, 'child')):
+        return copy.deepcopy(field)
+    return copy.copy(field)
+
+
+def get_fields(self):
+    cls = self.__class__
+    if cls not in _fields_cache:
+        _fields_cache[cls] = _original_get_fields(self)
+    return {name: _copy_field(field) for name, field in _fields_cache[cls].items()}
+
+
+def install():
+    serializers.ModelSerializer.get_fields = get_fields
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import DoctorAvailability, UserProfile
+from .utils import available_slots_cache_key
+
+
+@receiver(post_save, sender=DoctorAvailability)
+@receiver(post_delete, sender=DoctorAvailability)
+def invalidate_available_slots(sender, instance, **kwargs):
+    """Drop the doctor's cached available slots when one of their slots changes"""
+    cache.delete(available_slots_cache_key(instance.doctor_id))
+
+
+@receiver(pre_save, sender=UserProfile)
+def set_profile_full_name(sender, instance, **kwargs):
+    """Fill in the denormalized full name when a profile is saved"""
+    instance.full_name = instance.user.get_full_name()
+
+
+@receiver(post_save, sender=User)
+def sync_profile_full_name(sender, instance, update_fields=None, **kwargs):
+    """Propagate name changes on the user to their profile"""
+    # login() saves only last_login; skip saves that can't have changed the name
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    UserProfile.objects.filter(user=instance).exclude(
+        full_name=instance.get_full_name()
+    ).update(full_name=instance.get_full_name())
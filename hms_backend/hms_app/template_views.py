@@ -4,7 +4,6 @@ from django.shortcuts import redirect
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import UserProfile
 
 
 class HomeView(TemplateView):
@@ -19,11 +18,8 @@ class DoctorDashboardView(LoginRequiredMixin, TemplateView):
     
     def get(self, request, *args, **kwargs):
         # Check if user is a doctor
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            if profile.role != 'doctor':
-                return redirect('/')
-        except UserProfile.DoesNotExist:
+        profile = getattr(request.user, 'profile', None)
+        if profile is None or profile.role != 'doctor':
             return redirect('/')
         
         return super().get(request, *args, **kwargs)
@@ -36,11 +32,8 @@ class PatientDashboardView(LoginRequiredMixin, TemplateView):
     
     def get(self, request, *args, **kwargs):
         # Check if user is a patient
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            if profile.role != 'patient':
-                return redirect('/')
-        except UserProfile.DoesNotExist:
+        profile = getattr(request.user, 'profile', None)
+        if profile is None or profile.role != 'patient':
             return redirect('/')
         
         return super().get(request, *args, **kwargs)
@@ -53,11 +46,8 @@ class NurseDashboardView(LoginRequiredMixin, TemplateView):
     
     def get(self, request, *args, **kwargs):
         # Check if user is a nurse
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            if profile.role != 'nurse':
-                return redirect('/')
-        except UserProfile.DoesNotExist:
+        profile = getattr(request.user, 'profile', None)
+        if profile is None or profile.role != 'nurse':
             return redirect('/')
         
         return super().get(request, *args, **kwargs)
\ No newline at end of file
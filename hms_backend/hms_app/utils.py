@@ -0,0 +1,25 @@
+AVAILABLE_SLOTS_CACHE_TIMEOUT = 3600
+
+
+def get_profile(user, request):
+    """Return the UserProfile for ``user`` (or None), memoized on ``request``.
+
+    Permission classes and viewset methods all need the requester's role, so the
+    lookup is done once per request and reused instead of re-queried each time.
+    The authentication backend joins ``profile`` into the session user, so reading
+    the relation normally costs no query at all.
+    """
+    if not hasattr(request, '_cached_profile'):
+        request._cached_profile = getattr(user, 'profile', None)
+    return request._cached_profile
+
+
+def get_role(request):
+    """Return the requester's role (or None), read from the memoized profile."""
+    profile = get_profile(request.user, request)
+    return profile.role if profile is not None else None
+
+
+def available_slots_cache_key(doctor_id):
+    """Cache key for a doctor's serialized active availability slots."""
+    return f'doc_avail:{doctor_id}'
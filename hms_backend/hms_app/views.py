@@ -7,23 +7,32 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.contrib.auth import authenticate, login, logout
 import logging
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q, Prefetch
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 
 from .models import UserProfile, Doctor, DoctorAvailability, Appointment
 from .models import MedicalReport, Nurse
 from .serializers import (
-    UserSerializer, UserProfileSerializer, DoctorSerializer, 
+    UserSerializer, UserProfileSerializer, DoctorSerializer, DoctorListSerializer,
     DoctorAvailabilitySerializer, AppointmentSerializer,
     SignUpSerializer, DoctorSignUpSerializer, NurseSignUpSerializer, NurseSerializer
     , MedicalReportSerializer
 )
 from .permissions import IsDoctorOrReadOnly, IsPatientOrReadOnly, IsOwnerOrReadOnly, IsReportAuthorOrNurseOrReadOnly
+from .pagination import StandardResultsSetPagination
+from .utils import get_profile, available_slots_cache_key, AVAILABLE_SLOTS_CACHE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 
+def _doctor_for(user):
+    """Return the user's Doctor record, or None if they are not a doctor."""
+    return getattr(user, 'doctor_profile', None)
+
+
 # Authentication Views
 class SignUpView(viewsets.ViewSet):
     permission_classes = [AllowAny]
@@ -74,15 +83,11 @@ class SignUpView(viewsets.ViewSet):
         if user is not None:
             login(request, user)
             logger.info('Authentication successful for username=%s id=%s', username, user.id)
-            # Ensure a UserProfile exists for this user; create a default patient profile if absent
-            profile, created = UserProfile.objects.get_or_create(
-                user=user,
-                defaults={
-                    'role': 'patient',
-                    'phone_number': ''
-                }
-            )
-            if created:
+            # Ensure a UserProfile exists for this user; create a default patient profile if absent.
+            # The authentication backend already joined the profile in, so the common case costs no query.
+            profile = getattr(user, 'profile', None)
+            if profile is None:
+                profile = UserProfile.objects.create(user=user, role='patient', phone_number='')
                 logger.info('UserProfile auto-created for username=%s', username)
 
             # Log session info when available
@@ -115,14 +120,27 @@ class SignUpView(viewsets.ViewSet):
             logger.info('current_user request unauthenticated')
             return Response({'error': 'Not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
 
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
+        profile = get_profile(request.user, request)
+        if profile is None:
             logger.warning('current_user: profile not found for user id=%s', request.user.id)
             return Response({'error': 'UserProfile not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = UserProfileSerializer(profile)
-        return Response({'user': serializer.data})
+        # Polled on every dashboard load, so build the UserProfileSerializer shape by hand
+        user = request.user
+        return Response({
+            'user': {
+                'user': {
+                    'id': user.id,
+                    'username': user.username,
+                    'email': user.email,
+                    'first_name': user.first_name,
+                    'last_name': user.last_name,
+                },
+                'role': profile.role,
+                'phone_number': profile.phone_number,
+                'created_at': profile.created_at,
+            }
+        })
 
 
 # Doctor Views
@@ -130,34 +148,53 @@ class DoctorViewSet(viewsets.ModelViewSet):
     queryset = Doctor.objects.all()
     serializer_class = DoctorSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    # Columns rendered by DoctorListSerializer; everything else (bio, audit columns) is left out of list queries
+    list_only_fields = (
+        'id', 'specialization', 'experience_years', 'consultation_fee', 'is_available',
+        'user__id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    )
     
     def get_queryset(self):
-        user = self.request.user
-        # Doctors see only their own profile, patients see all available doctors
-        try:
-            profile = UserProfile.objects.get(user=user)
-            if profile.role == 'doctor':
-                return Doctor.objects.filter(user=user)
-            else:
-                return Doctor.objects.filter(is_available=True)
-        except UserProfile.DoesNotExist:
-            return Doctor.objects.none()
-    
+        queryset = Doctor.objects.visible_to(self.request.user)
+        # The list serializer doesn't render slots and available_slots is served from the cache,
+        # so only prefetch them for the remaining detail views
+        if self.action == 'list':
+            return queryset.only(*self.list_only_fields)
+        if self.action == 'available_slots':
+            return queryset
+        # A doctor's own profile shows all of their slots; everyone else only sees active ones
+        profile = get_profile(self.request.user, self.request)
+        if profile is not None and profile.role == 'doctor':
+            return queryset.prefetch_related('availability_slots')
+        return queryset.prefetch_related(
+            Prefetch('availability_slots', queryset=DoctorAvailability.objects.filter(is_active=True))
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return DoctorListSerializer
+        return DoctorSerializer
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_profile(self, request):
-        try:
-            doctor = Doctor.objects.get(user=request.user)
-            serializer = self.get_serializer(doctor)
-            return Response(serializer.data)
-        except Doctor.DoesNotExist:
+        doctor = _doctor_for(request.user)
+        if doctor is None:
             return Response({'error': 'Doctor profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(doctor)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def available_slots(self, request, pk=None):
         doctor = self.get_object()
-        slots = DoctorAvailability.objects.filter(doctor=doctor, is_active=True)
-        serializer = DoctorAvailabilitySerializer(slots, many=True)
-        return Response(serializer.data)
+        # Slots change rarely; the cache entry is dropped whenever one is saved or deleted (see signals.py)
+        cache_key = available_slots_cache_key(doctor.pk)
+        data = cache.get(cache_key)
+        if data is None:
+            slots = DoctorAvailability.objects.filter(doctor=doctor, is_active=True)
+            data = DoctorAvailabilitySerializer(slots, many=True).data
+            cache.set(cache_key, data, timeout=AVAILABLE_SLOTS_CACHE_TIMEOUT)
+        return Response(data)
 
 
 class DoctorAvailabilityViewSet(viewsets.ModelViewSet):
@@ -165,55 +202,48 @@ class DoctorAvailabilityViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
-        try:
-            doctor = Doctor.objects.get(user=user)
-            return DoctorAvailability.objects.filter(doctor=doctor)
-        except Doctor.DoesNotExist:
+        doctor = _doctor_for(self.request.user)
+        if doctor is None:
             return DoctorAvailability.objects.none()
+        return DoctorAvailability.objects.filter(doctor=doctor).select_related('doctor__user')
     
     def perform_create(self, serializer):
-        try:
-            doctor = Doctor.objects.get(user=self.request.user)
-            serializer.save(doctor=doctor)
-        except Doctor.DoesNotExist:
+        doctor = _doctor_for(self.request.user)
+        if doctor is None:
             raise NotFound('Doctor profile not found')
+        serializer.save(doctor=doctor)
     
     def perform_update(self, serializer):
-        try:
-            doctor = Doctor.objects.get(user=self.request.user)
-            serializer.save(doctor=doctor)
-        except Doctor.DoesNotExist:
+        doctor = _doctor_for(self.request.user)
+        if doctor is None:
             raise NotFound('Doctor profile not found')
+        serializer.save(doctor=doctor)
 
 
 # Appointment Views
 class AppointmentViewSet(viewsets.ModelViewSet):
     serializer_class = AppointmentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+    # Columns rendered by AppointmentSerializer; names come from the annotation, so lists skip the joined rows
+    list_only_fields = (
+        'id', 'doctor', 'patient', 'appointment_date', 'start_time', 'end_time', 'reason', 'status', 'notes',
+    )
     
     def get_queryset(self):
-        user = self.request.user
-        try:
-            profile = UserProfile.objects.get(user=user)
-            if profile.role == 'doctor':
-                doctor = Doctor.objects.get(user=user)
-                return Appointment.objects.filter(doctor=doctor)
-            elif profile.role == 'nurse':
-                # Nurses can see all appointments
-                return Appointment.objects.all()
-            else:
-                return Appointment.objects.filter(patient=user)
-        except (UserProfile.DoesNotExist, Doctor.DoesNotExist):
-            return Appointment.objects.none()
+        queryset = Appointment.objects.for_user(self.request.user)
+        # Only project columns for lists; saving a partially loaded instance would skip auto_now fields
+        if self.action == 'list':
+            return queryset.with_participant_names().only(*self.list_only_fields)
+        # Names come from the joined rows here: an update can reassign doctor/patient,
+        # which would leave annotated names stale
+        return queryset.select_related('doctor__user', 'patient')
     
     def perform_create(self, serializer):
         serializer.save(patient=self.request.user)
     
     @action(detail=False, methods=['post'])
     def book_appointment(self, request):
-        from django.db import IntegrityError
-
         doctor_id = request.data.get('doctor_id')
         appointment_date = request.data.get('appointment_date')
         start_time = request.data.get('start_time')
@@ -221,35 +251,29 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         reason = request.data.get('reason', '')
 
         try:
-            doctor = Doctor.objects.get(id=doctor_id)
+            doctor = Doctor.objects.select_related('user').get(pk=doctor_id)
         except Doctor.DoesNotExist:
             return Response({'error': 'Doctor not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        # Check if appointment already exists
-        if Appointment.objects.filter(
-            doctor=doctor,
-            appointment_date=appointment_date,
-            start_time=start_time,
-            status='scheduled'
-        ).exists():
-            return Response({'error': 'Time slot already booked'}, status=status.HTTP_400_BAD_REQUEST)
-
+        # The (doctor, appointment_date, start_time) unique constraint rejects
+        # double bookings, so a taken slot surfaces as an IntegrityError here
         try:
-            appointment = Appointment.objects.create(
-                doctor=doctor,
-                patient=request.user,
-                appointment_date=appointment_date,
-                start_time=start_time,
-                end_time=end_time,
-                reason=reason,
-                status='scheduled'
-            )
-
-            serializer = self.get_serializer(appointment)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            with transaction.atomic():
+                appointment = Appointment.objects.create(
+                    doctor=doctor,
+                    patient=request.user,
+                    appointment_date=appointment_date,
+                    start_time=start_time,
+                    end_time=end_time,
+                    reason=reason,
+                    status='scheduled'
+                )
         except IntegrityError as e:
-            logger.error('IntegrityError booking appointment: %s', str(e))
-            return Response({'error': 'This time slot is already booked. Please select a different time.'}, status=status.HTTP_400_BAD_REQUEST)
+            logger.info('Time slot already booked for doctor id=%s: %s', doctor.id, str(e))
+            return Response({'error': 'Time slot already booked'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(appointment)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'])
     def reschedule(self, request):
@@ -259,16 +283,15 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         new_start_time = request.data.get('start_time')
         new_end_time = request.data.get('end_time')
 
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
+        profile = get_profile(request.user, request)
+        if profile is None:
             return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
 
         if profile.role not in ['nurse', 'doctor']:
             return Response({'error': 'Only nurses and doctors can reschedule appointments'}, status=status.HTTP_403_FORBIDDEN)
 
         try:
-            appointment = Appointment.objects.get(id=appointment_id)
+            appointment = Appointment.objects.select_related('doctor__user', 'patient').get(id=appointment_id)
         except Appointment.DoesNotExist:
             return Response({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -329,52 +352,31 @@ class MedicalReportViewSet(viewsets.ModelViewSet):
     """ViewSet for creating and viewing medical reports. Doctors can create and view reports for patients they have appointments with; doctors can view history."""
     serializer_class = MedicalReportSerializer
     permission_classes = [IsAuthenticated, IsReportAuthorOrNurseOrReadOnly]
+    pagination_class = StandardResultsSetPagination
 
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
         # If doctor, return reports for patients the doctor has seen; nurses can see all; patients see their own
-        user = self.request.user
-        try:
-            profile = UserProfile.objects.get(user=user)
-        except UserProfile.DoesNotExist:
-            return MedicalReport.objects.none()
-
-        if profile.role == 'doctor':
-            try:
-                doctor = Doctor.objects.get(user=user)
-                # Reports written by this doctor or for patients this doctor has appointments with
-                patient_ids = Appointment.objects.filter(doctor=doctor).values_list('patient', flat=True).distinct()
-                return MedicalReport.objects.filter(patient__in=patient_ids)
-            except Doctor.DoesNotExist:
-                return MedicalReport.objects.none()
-        elif profile.role == 'nurse':
-            # Nurses can see all reports
-            return MedicalReport.objects.all()
-        else:
-            # patient: only their own reports
-            return MedicalReport.objects.filter(patient=user)
+        return MedicalReport.objects.for_user(self.request.user)
 
     def perform_create(self, serializer):
         # Allow doctor's user to attach their Doctor record; allow nurse to attach Nurse record
         user = self.request.user
-        try:
-            profile = UserProfile.objects.get(user=user)
-            if profile.role == 'doctor':
-                try:
-                    doctor = Doctor.objects.get(user=user)
-                    serializer.save(doctor=doctor)
-                except Doctor.DoesNotExist:
-                    serializer.save()
-            elif profile.role == 'nurse':
-                try:
-                    nurse = Nurse.objects.get(user=user)
-                    serializer.save(nurse=nurse)
-                except Nurse.DoesNotExist:
-                    serializer.save()
+        profile = get_profile(user, self.request)
+        if profile is not None and profile.role == 'doctor':
+            doctor = _doctor_for(user)
+            if doctor is not None:
+                serializer.save(doctor=doctor)
             else:
                 serializer.save()
-        except UserProfile.DoesNotExist:
+        elif profile is not None and profile.role == 'nurse':
+            try:
+                nurse = Nurse.objects.get(user=user)
+                serializer.save(nurse=nurse)
+            except Nurse.DoesNotExist:
+                serializer.save()
+        else:
             serializer.save()
 
     def list(self, request, *args, **kwargs):
@@ -382,31 +384,35 @@ class MedicalReportViewSet(viewsets.ModelViewSet):
         qs = self.get_queryset()
         patient_id = request.query_params.get('patient_id')
         if patient_id:
-            try:
-                patient = User.objects.get(id=patient_id)
-            except User.DoesNotExist:
-                return Response({'error': 'Patient not found'}, status=status.HTTP_404_NOT_FOUND)
-
-            # If requester is doctor, verify they have appointments with this patient
-            try:
-                profile = UserProfile.objects.get(user=request.user)
-            except UserProfile.DoesNotExist:
+            profile = get_profile(request.user, request)
+            if profile is None:
                 return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
 
+            patients = User.objects.filter(id=patient_id)
             if profile.role == 'doctor':
-                try:
-                    doctor = Doctor.objects.get(user=request.user)
-                    if not Appointment.objects.filter(doctor=doctor, patient=patient).exists():
-                        return Response({'error': 'No access to this patient'}, status=status.HTTP_403_FORBIDDEN)
-                except Doctor.DoesNotExist:
+                doctor = _doctor_for(request.user)
+                if doctor is None:
                     return Response({'error': 'Doctor profile not found'}, status=status.HTTP_404_NOT_FOUND)
-            else:
+                # Look up the patient and whether this doctor has appointments with them in one query
+                has_access = patients.annotate(
+                    has_access=Exists(Appointment.objects.filter(doctor=doctor, patient=OuterRef('pk')))
+                ).values_list('has_access', flat=True).first()
+                if has_access is None:
+                    return Response({'error': 'Patient not found'}, status=status.HTTP_404_NOT_FOUND)
+                if not has_access:
+                    return Response({'error': 'No access to this patient'}, status=status.HTTP_403_FORBIDDEN)
+            elif request.user.id != int(patient_id):
                 # patients can only request their own id
-                if request.user.id != int(patient_id):
-                    return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
+                if not patients.exists():
+                    return Response({'error': 'Patient not found'}, status=status.HTTP_404_NOT_FOUND)
+                return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
 
-            qs = qs.filter(patient=patient)
+            qs = qs.filter(patient_id=patient_id)
 
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
 
@@ -420,12 +426,9 @@ class NurseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Nurses can only see themselves
         user = self.request.user
-        try:
-            profile = UserProfile.objects.get(user=user)
-            if profile.role == 'nurse':
-                return Nurse.objects.filter(user=user)
-        except UserProfile.DoesNotExist:
-            pass
+        profile = get_profile(user, self.request)
+        if profile is not None and profile.role == 'nurse':
+            return Nurse.objects.filter(user=user)
         return Nurse.objects.none()
 
 
@@ -441,9 +444,8 @@ class AppointmentRescheduleViewSet(viewsets.ViewSet):
         new_start_time = request.data.get('start_time')
         new_end_time = request.data.get('end_time')
 
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-        except UserProfile.DoesNotExist:
+        profile = get_profile(request.user, request)
+        if profile is None:
             return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
 
         # Only nurses and doctors can reschedule
@@ -452,7 +454,7 @@ class AppointmentRescheduleViewSet(viewsets.ViewSet):
                           status=status.HTTP_403_FORBIDDEN)
 
         try:
-            appointment = Appointment.objects.get(id=appointment_id)
+            appointment = Appointment.objects.select_related('doctor__user', 'patient').get(id=appointment_id)
         except Appointment.DoesNotExist:
             return Response({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -497,9 +499,8 @@ class UserProfileViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         # limit access: doctors and nurses can view profiles; patients can view only themselves
         user = self.request.user
-        try:
-            profile = UserProfile.objects.get(user=user)
-        except UserProfile.DoesNotExist:
+        profile = get_profile(user, self.request)
+        if profile is None:
             return UserProfile.objects.none()
 
         if profile.role in ['doctor', 'nurse']:
@@ -111,6 +111,31 @@ INSTALLED_APPS = [
         },
     ]
 
+    # Authentication backend that loads the user's profile/doctor_profile with the session user.
+    # ModelBackend stays listed so sessions created before the switch still resolve; it can be
+    # dropped once those have expired (SESSION_COOKIE_AGE).
+    AUTHENTICATION_BACKENDS = [
+        'hms_app.backends.ProfileModelBackend',
+        'django.contrib.auth.backends.ModelBackend',
+    ]
+
+    # Cache (doctor availability). It must be shared by all Gunicorn workers so slot invalidation
+    # reaches every process; without a Redis server caching is disabled rather than per-process.
+    REDIS_URL = config('REDIS_URL', default='')
+    if REDIS_URL:
+        CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': REDIS_URL,
+            }
+        }
+    else:
+        CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            }
+        }
+
     # Internationalization
     LANGUAGE_CODE = 'en-us'
     TIME_ZONE = 'UTC'
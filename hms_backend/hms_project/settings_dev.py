@@ -82,6 +82,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Authentication backend that loads the user's profile/doctor_profile with the session user.
+# ModelBackend stays listed so sessions created before the switch still resolve; it can be
+# dropped once those have expired (SESSION_COOKIE_AGE).
+AUTHENTICATION_BACKENDS = [
+    'hms_app.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Cache (doctor availability) - in-process memory is enough for the single dev server
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'